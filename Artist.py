@@ -12,10 +12,16 @@ average popularity with overall genre popularity.
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from IPython.display import display
 
+# Bar colours resolved to RGBA once rather than parsed on every plot
+ARTIST_COLOR = to_rgba('blue')
+GENRE_COLOR = to_rgba('orange', alpha=0.7)
+
 class ArtistPopularityAnalyzer:
     """
     A class to analyze and visualize an artist's popularity compared to 
@@ -28,8 +34,8 @@ class ArtistPopularityAnalyzer:
 
     Methods:
         get_artist_id: Retrieves the artist's ID from the database using their name.
-        get_artist_popularity_per_genre: Retrieves the artist's average popularity by genre.
-        get_overall_genre_popularity: Retrieves the overall average popularity by genre.
+        get_popularity_comparison: Retrieves the artist's and the overall average 
+        popularity by genre.
         display_artist_vs_genre_popularity: Displays and visualizes a comparison between 
         the artist's and genre's popularity.
         close_connection: Closes the connection to the SQLite database.
@@ -44,9 +50,19 @@ class ArtistPopularityAnalyzer:
             db_name (str): Name of the SQLite database file.
         """
         self.db_name = db_name
-        self.conn = sqlite3.connect(db_name)
+        # Analysis is read-only, so open the database read-only with memory-mapped I/O
+        self.conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True, isolation_level=None)
+        self.conn.executescript("""
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA query_only=1;
+        """)
         self.cursor = self.conn.cursor()
 
+        # Lookup SQL is kept as one string so repeated calls reuse the prepared statement
+        self._sql_get_artist = "SELECT id FROM Artist WHERE artist_name = ?"
+
     def get_artist_id(self, artist_name):
         """
         Retrieve the ID of the specified artist from the database.
@@ -57,51 +73,38 @@ class ArtistPopularityAnalyzer:
         Returns:
             int or None: The artist's ID if found, otherwise None.
         """
+        # Normalise the input like the stored names so the lookup can use the UNIQUE index
         artist_name = artist_name.lower().replace(" ", "_")
-        self.cursor.execute("SELECT id FROM Artist WHERE artist_name = ?", (artist_name,))
+        self.cursor.execute(self._sql_get_artist, (artist_name,))
         artist_id = self.cursor.fetchone()
         if artist_id is None:
             print(f"Artist '{artist_name}' not found in the database.")
             return None
         return artist_id[0]
 
-    def get_artist_popularity_per_genre(self, artist_id):
+    def get_popularity_comparison(self, artist_id):
         """
-        Retrieve the average popularity of the artist's songs by genre.
+        Retrieve the artist's average popularity and the overall average popularity
+        for every genre in a single pass over the SongStats summary table.
 
         Args:
             artist_id (int): ID of the artist.
 
         Returns:
-            list: List of tuples containing genre names and the artist's average popularity.
-        """
-        query = """
-        SELECT Genre.genre_name, AVG(Song.popularity) AS avg_artist_popularity
-        FROM Song
-        JOIN SongGenre ON Song.id = SongGenre.song_id
-        JOIN Genre ON SongGenre.genre_id = Genre.id
-        WHERE Song.artist_id = ?
-        GROUP BY Genre.genre_name
-        """
-        self.cursor.execute(query, (artist_id,))
-        return self.cursor.fetchall()
-
-    def get_overall_genre_popularity(self):
-        """
-        Retrieve the overall average popularity of each genre.
-
-        Returns:
-            list: List of tuples containing genre names and their overall average popularity.
+            DataFrame: Genre names with the artist's and the overall average popularity.
+            The artist's value is NaN for genres they have no songs in.
         """
         query = """
-        SELECT Genre.genre_name, AVG(Song.popularity) AS avg_genre_popularity
-        FROM Song
-        JOIN SongGenre ON Song.id = SongGenre.song_id
-        JOIN Genre ON SongGenre.genre_id = Genre.id
+        SELECT Genre.genre_name AS genre,
+               AVG(CASE WHEN SongStats.artist_id = ? THEN SongStats.popularity END) 
+                   AS avg_artist_popularity,
+               AVG(SongStats.popularity) AS avg_genre_popularity
+        FROM SongStats
+        JOIN Genre ON SongStats.genre_id = Genre.id
         GROUP BY Genre.genre_name
+        ORDER BY Genre.genre_name
         """
-        self.cursor.execute(query)
-        return self.cursor.fetchall()
+        return pd.read_sql_query(query, self.conn, params=(artist_id,))
 
     def display_artist_vs_genre_popularity(self, artist_name):
         """
@@ -114,44 +117,37 @@ class ArtistPopularityAnalyzer:
         if not artist_id:
             return
 
-        artist_genre_popularity = self.get_artist_popularity_per_genre(artist_id)
-        artist_df = pd.DataFrame(artist_genre_popularity, columns=["genre", "avg_artist_popularity"])
-
-        overall_genre_popularity = self.get_overall_genre_popularity()
-        overall_df = pd.DataFrame(overall_genre_popularity, columns=["genre", "avg_genre_popularity"])
-
-        comparison_df = pd.merge(artist_df, overall_df, on="genre", how="outer")
+        comparison_df = self.get_popularity_comparison(artist_id)
 
         # Highlight rows where artist's popularity exceeds genre's popularity
-        def highlight_row(row):
-            if row["avg_artist_popularity"] > row["avg_genre_popularity"]:
-                return ["background-color: yellow" for _ in row]
-            else:
-                return ["" for _ in row]
-        
-        styled_table = comparison_df.style.apply(highlight_row, axis=1)
+        def highlight_rows(df):
+            above = (df["avg_artist_popularity"] > df["avg_genre_popularity"]).to_numpy()
+            return np.where(np.broadcast_to(above[:, None], df.shape), "background-color: yellow", "")
+
+        styled_table = comparison_df.style.apply(highlight_rows, axis=None)
         print(f"Popularity Comparison for Artist: {artist_name}")
         display(styled_table)  # Display styled DataFrame
 
         # Plotting a bar chart for the artist's vs genre's popularity
-        plt.figure(figsize=(10, 6))
+        fig, ax = plt.subplots(figsize=(10, 6))
         width = 0.35  # Bar width
         genres = comparison_df["genre"]
         artist_pop = comparison_df["avg_artist_popularity"]
         genre_pop = comparison_df["avg_genre_popularity"]
 
-        x = range(len(genres))
-        plt.bar([p - width / 2 for p in x], artist_pop, width, 
-                label="Artist's Popularity", color='blue')
-        plt.bar([p + width / 2 for p in x], genre_pop, width, 
-                label="Overall Genre Popularity", color='orange', alpha=0.7)
-
-        plt.xlabel('Genre')
-        plt.ylabel('Average Popularity')
-        plt.title(f"Artist vs Overall Genre Popularity for {artist_name}")
-        plt.xticks(x, genres, rotation=45, ha='right')
-        plt.legend()
-        plt.tight_layout()
+        x = np.arange(len(genres))
+        ax.bar(x - width / 2, artist_pop, width, 
+               label="Artist's Popularity", color=ARTIST_COLOR)
+        ax.bar(x + width / 2, genre_pop, width, 
+               label="Overall Genre Popularity", color=GENRE_COLOR)
+
+        ax.set_xlabel('Genre')
+        ax.set_ylabel('Average Popularity')
+        ax.set_title(f"Artist vs Overall Genre Popularity for {artist_name}")
+        ax.set_xticks(x)
+        ax.set_xticklabels(genres, rotation=45, ha='right')
+        ax.legend()
+        fig.tight_layout()
         plt.show()
 
     def close_connection(self):
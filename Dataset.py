@@ -0,0 +1,7 @@
+"""
+Program: Dataset Settings
+This module holds constants describing the song dataset that are shared by the 
+analyzer scripts.
+"""
+
+VALID_YEARS = (1998, 2020)  # First and last year covered by the dataset
@@ -13,6 +13,7 @@ The program outputs a statistical summary and a pie chart of genre distribution.
 import sqlite3
 import pandas as pd
 import matplotlib.pyplot as plt
+import Dataset
 
 class GenreStatisticsAnalyzer:
     """
@@ -24,13 +25,15 @@ class GenreStatisticsAnalyzer:
         cursor (sqlite3.Cursor): Cursor object for executing SQL queries.
 
     Methods:
-        get_valid_year: Prompts the user to enter a valid year between 1998 and 2020.
-        get_songs_for_year: Retrieves songs and their genres for a specific 
-        year from the database.
+        get_valid_year: Prompts the user to enter a valid year within VALID_YEARS.
+        get_genre_statistics: Retrieves per-genre song counts and averages for a 
+        specific year from the database.
         generate_genre_statistics: Calculates and displays genre-based statistics 
         and visualisations for the specified year.
         close_connection: Closes the connection to the SQLite database.
     """
+    VALID_YEARS = Dataset.VALID_YEARS
+
     def __init__(self, db_name):
         """
         Initializes the GenreStatisticsAnalyzer with the database name 
@@ -40,47 +43,58 @@ class GenreStatisticsAnalyzer:
             db_name (str): Name of the SQLite database file.
         """
         self.db_name = db_name
-        self.conn = sqlite3.connect(db_name)
+        # Analysis is read-only, so open the database read-only with memory-mapped I/O
+        self.conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True, isolation_level=None)
+        self.conn.executescript("""
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA query_only=1;
+        """)
         self.cursor = self.conn.cursor()
 
     def get_valid_year(self):
         """
-        Prompt the user to input a valid year between 1998 and 2020.
+        Prompt the user to input a valid year within the VALID_YEARS range.
 
         Returns:
             int: A valid year entered by the user.
         """
+        first_year, last_year = self.VALID_YEARS
         while True:
-            year = input("Please enter a year between 1998 and 2020: ")
+            year = input(f"Please enter a year between {first_year} and {last_year}: ")
             try:
                 year = int(year)
-                if 1998 <= year <= 2020:
+                if first_year <= year <= last_year:
                     return year
                 else:
-                    print("Year out of range. Please enter a year between 1998 and 2020.")
+                    print(f"Year out of range. Please enter a year between {first_year} and {last_year}.")
             except ValueError:
                 print("Invalid input. Please enter a valid year (e.g., 2000).")
 
-    def get_songs_for_year(self, year):
+    def get_genre_statistics(self, year):
         """
-        Retrieve all songs and their genres for a specific year from the database.
+        Retrieve genre-based statistics for the songs of a specific year from the database.
 
         Args:
-            year (int): The year for which to retrieve song data.
+            year (int): The year for which to retrieve statistics.
 
         Returns:
-            list: A list of tuples containing song details (song name, year, danceability, 
-            popularity, genre).
+            DataFrame: One row per genre with the total number of songs, 
+            average danceability, and average popularity.
         """
         query = """
-        SELECT Song.song_name, Song.year, Song.danceability, Song.popularity, Genre.genre_name
-        FROM Song
-        JOIN SongGenre ON Song.id = SongGenre.song_id
-        JOIN Genre ON SongGenre.genre_id = Genre.id
-        WHERE Song.year = ?
+        SELECT Genre.genre_name AS genre,
+               COUNT(*) AS total_songs,
+               AVG(SongStats.danceability) AS avg_danceability,
+               AVG(SongStats.popularity) AS avg_popularity
+        FROM SongStats
+        JOIN Genre ON SongStats.genre_id = Genre.id
+        WHERE SongStats.year = ?
+        GROUP BY Genre.genre_name
+        ORDER BY Genre.genre_name
         """
-        self.cursor.execute(query, (year,))
-        return self.cursor.fetchall()
+        return pd.read_sql_query(query, self.conn, params=(year,), dtype={"total_songs": "int32"})
 
     def generate_genre_statistics(self, year):
         """
@@ -94,22 +108,13 @@ class GenreStatisticsAnalyzer:
             average danceability, and popularity).
             - A pie chart showing the distribution of songs by genre.
         """
-        data = self.get_songs_for_year(year)
+        # Key statistics for each genre are aggregated by SQLite
+        genre_stats = self.get_genre_statistics(year)
 
-        if not data:
+        if genre_stats.empty:
             print(f"No data available for the year {year}.")
             return
 
-        # Convert data into a DataFrame
-        df = pd.DataFrame(data, columns=["song_name", "year", "danceability", "popularity", "genre"])
-
-        # Calculate key statistics for each genre
-        genre_stats = df.groupby("genre").agg(
-            total_songs=("song_name", "count"),
-            avg_danceability=("danceability", "mean"),
-            avg_popularity=("popularity", "mean")
-        ).reset_index()
-
         # Display the tabular summary
         print(f"Statistics for songs in {year}:")
         print(genre_stats)
@@ -117,16 +122,16 @@ class GenreStatisticsAnalyzer:
         # Visualize the data (Pie chart for the total number of songs per genre)
         genre_counts = genre_stats["total_songs"]
         genre_labels = genre_stats["genre"]
-        plt.figure(figsize=(8, 6))
-        plt.pie(
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.pie(
             genre_counts,
             labels=genre_labels,
             autopct='%1.1f%%',
             startangle=140,
             colors=plt.cm.Paired.colors
         )
-        plt.title(f"Distribution of Songs by Genre in {year}")
-        plt.axis('equal')
+        ax.set_title(f"Distribution of Songs by Genre in {year}")
+        ax.axis('equal')
         plt.show()
 
     def close_connection(self):
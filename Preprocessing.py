@@ -9,6 +9,9 @@ database file 'CWDatabase.db' and populates it with preprocessed data.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 import sqlite3
 
 class SongDatasetProcessor:
@@ -23,6 +26,20 @@ class SongDatasetProcessor:
     Methods:
         load_and_preprocess_data: Reads the dataset, applies filtering, and preprocesses columns.
     """
+    # Columns read from the CSV and their Arrow types. The filtered float columns stay
+    # float64 so the threshold comparisons match the original values exactly.
+    COLUMN_TYPES = {
+        "song": pa.string(),
+        "artist": pa.string(),
+        "genre": pa.string(),
+        "duration_ms": pa.int32(),
+        "explicit": pa.bool_(),
+        "year": pa.int16(),
+        "popularity": pa.int16(),
+        "danceability": pa.float64(),
+        "speechiness": pa.float64()
+    }
+
     def __init__(self, csv_path, db_name):
         """
         Initializes the SongDatasetProcessor with the dataset path and database name.
@@ -38,20 +55,42 @@ class SongDatasetProcessor:
     def load_and_preprocess_data(self):
         """
         Reads and preprocesses the dataset:
+        - Reads only the required columns with PyArrow.
+        - Filters rows based on popularity, speechiness, and danceability criteria 
+          before converting to pandas.
         - Renames the 'duration_ms' column to 'duration' and converts its units to seconds.
-        - Filters rows based on popularity, speechiness, and danceability criteria.
+        - Downcasts the integer columns to compact dtypes.
         - Standardizes artist names by converting to lowercase and replacing spaces with underscores.
+        - Splits the comma-separated genres into a 'genre_list' column.
         """
-        self.df = pd.read_csv(self.csv_path)
+        table = pacsv.read_csv(
+            self.csv_path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(self.COLUMN_TYPES),
+                column_types=self.COLUMN_TYPES
+            )
+        )
+        # Filter in Arrow so rejected rows are never converted to pandas
+        table = table.filter(pc.and_(
+            pc.and_(pc.greater(table["popularity"], 50), pc.greater(table["danceability"], 0.20)),
+            pc.and_(pc.greater_equal(table["speechiness"], 0.33),
+                    pc.less_equal(table["speechiness"], 0.66))
+        ))
+        table = table.append_column("genre_list", pc.split_pattern(table["genre"], ", "))
+        self.df = table.to_pandas(types_mapper=pd.ArrowDtype)
         self.df.rename(columns={"duration_ms": "duration"}, inplace=True)
-        self.df["duration"] = (self.df["duration"] / 1000).round().astype(int)
-        self.df = self.df[
-            (self.df["popularity"] > 50) &
-            (self.df["speechiness"] >= 0.33) &
-            (self.df["speechiness"] <= 0.66) &
-            (self.df["danceability"] > 0.20)
-        ]
-        self.df["artist"] = self.df["artist"].str.lower().str.replace(" ", "_")
+        self.df["duration"] = (self.df["duration"] / 1000).round()
+        # Python str.lower on object dtype, matching the lookup in Artist.get_artist_id
+        self.df["artist"] = (
+            self.df["artist"].astype(object).str.lower().str.replace(" ", "_", regex=False)
+        )
+        # Narrow integer columns to the smallest types that fit their value ranges
+        self.df = self.df.astype({
+            "year": "int16",
+            "popularity": "int8",
+            "duration": "int32",
+            "explicit": "int8"
+        })
         self.df.reset_index(drop=True, inplace=True)
         print(f"Filtered dataset contains {len(self.df)} songs.")
 
@@ -67,8 +106,9 @@ class DatabaseManager:
     Methods:
         create_tables: Creates database tables for storing songs, artists, genres, 
         and their many to many relationships.
-        get_or_create_id: Retrieves or inserts a record in the specified table and returns its ID.
+        insert_unique: Inserts any new values into the specified table and returns all their IDs.
         populate_database: Inserts processed dataset rows into the database tables.
+        create_summary_table: Rebuilds the SongStats table of per-song-genre statistics.
         close_connection: Closes the database connection.
     """
     def __init__(self, db_name):
@@ -82,6 +122,19 @@ class DatabaseManager:
         self.conn = sqlite3.connect(db_name)
         self.cursor = self.conn.cursor()
 
+        # Insert and ID lookup SQL per (table, column), composed once so every call
+        # sends byte-identical text and reuses SQLite's cached prepared statements
+        self._sql_unique = {
+            ("Artist", "artist_name"): (
+                "INSERT OR IGNORE INTO Artist (artist_name) VALUES (?)",
+                "SELECT artist_name, id FROM Artist"
+            ),
+            ("Genre", "genre_name"): (
+                "INSERT OR IGNORE INTO Genre (genre_name) VALUES (?)",
+                "SELECT genre_name, id FROM Genre"
+            )
+        }
+
     def create_tables(self):
         """
         Creates normalized tables in the database:
@@ -128,63 +181,106 @@ class DatabaseManager:
             FOREIGN KEY (genre_id) REFERENCES Genre(id)
         );
         """)
+
+        # Covering index for the per-artist and per-year song aggregates
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS song_artist_idx
+        ON Song (artist_id, year, popularity, danceability);
+        """)
         self.conn.commit()
 
-    def get_or_create_id(self, table, column, value):
+    def insert_unique(self, table, column, values):
         """
-        Retrieves the ID of a record in the specified table by column and value.
-        If the record does not exist, inserts it and returns the new ID.
+        Inserts the given values into the specified table, skipping any that already
+        exist, and returns the IDs of every record in the table.
 
         Parameters:
             table (str): Table name.
-            column (str): Column name to search for.
-            value (str): Value to search for.
+            column (str): Column name holding the unique values.
+            values (iterable): Values to insert.
 
         Returns:
-            int: ID of the existing or newly created record.
+            dict: Mapping of column value to record ID.
         """
-        self.cursor.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,))
-        row_id = self.cursor.fetchone()
-        if row_id is None:
-            self.cursor.execute(f"INSERT INTO {table} ({column}) VALUES (?)", (value,))
-            self.conn.commit()
-            return self.cursor.lastrowid
-        return row_id[0]
+        insert_sql, select_sql = self._sql_unique[(table, column)]
+        # The UNIQUE constraint makes SQLite skip existing values during the insert itself
+        self.cursor.executemany(insert_sql, ((value,) for value in values))
+        return dict(self.cursor.execute(select_sql))
 
     def populate_database(self, data):
         """
         Populates the database with song data from the processed dataset.
 
+        Artists and genres are inserted once per unique value and their IDs are
+        mapped back onto the dataset, so every table is filled with a single batch
+        insert inside one transaction.
+
         Parameters:
-            data (DataFrame): Processed dataset containing song, artist, and genre details.
+            data (DataFrame): Processed dataset containing song, artist, and genre details, 
+            with the integer columns and genre lists prepared by SongDatasetProcessor.
         """
-        for _, row in data.iterrows():
-            artist_id = self.get_or_create_id("Artist", "artist_name", row["artist"])
-            self.cursor.execute("""
-            INSERT INTO Song (song_name, duration, explicit, year, popularity, danceability, 
-            speechiness, artist_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row["song"],
-                row["duration"],
-                int(row["explicit"]),
-                row["year"],
-                row["popularity"],
-                row["danceability"],
-                row["speechiness"],
-                artist_id
-            ))
-            song_id = self.cursor.lastrowid
-
-            genres = row["genre"].split(", ")
-            for genre in genres:
-                genre_id = self.get_or_create_id("Genre", "genre_name", genre)
-                self.cursor.execute("""
-                INSERT INTO SongGenre (song_id, genre_id)
-                VALUES (?, ?)
-                """, (song_id, genre_id))
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=OFF")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("BEGIN")
+
+        # Insert unique artists and load their IDs
+        artist_ids = self.insert_unique("Artist", "artist_name", data["artist"].unique())
+
+        # Song IDs are assigned here so the SongGenre pairs can be built without lastrowid
+        self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Song")
+        first_song_id = self.cursor.fetchone()[0] + 1
+        songs = data.assign(
+            id=range(first_song_id, first_song_id + len(data)),
+            artist_id=data["artist"].map(artist_ids)
+        )
+        self.cursor.executemany("""
+        INSERT INTO Song (id, song_name, duration, explicit, year, popularity, danceability, 
+        speechiness, artist_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, songs[[
+            "id", "song", "duration", "explicit", "year", "popularity",
+            "danceability", "speechiness", "artist_id"
+        ]].itertuples(index=False, name=None))
+
+        # Insert unique genres and load their IDs
+        song_genres = songs[["id", "genre_list"]].explode("genre_list").rename(
+            columns={"genre_list": "genre"}
+        )
+        genre_ids = self.insert_unique("Genre", "genre_name", song_genres["genre"].unique())
+
+        song_genres = song_genres.assign(genre_id=song_genres["genre"].map(genre_ids))
+        self.cursor.executemany("""
+        INSERT INTO SongGenre (song_id, genre_id)
+        VALUES (?, ?)
+        """, song_genres[["id", "genre_id"]].itertuples(index=False, name=None))
+        self.create_summary_table()
+
+        # Refresh planner statistics now that the indexed tables hold data
+        self.cursor.execute("ANALYZE;")
         self.conn.commit()
 
+        # Leave the file in rollback-journal mode so read-only connections need no
+        # -wal/-shm files and work from directories they cannot write to. The pragma's
+        # result is fetched so the switch completes before the connection is closed.
+        self.cursor.execute("PRAGMA journal_mode=DELETE")
+        self.cursor.fetchall()
+
+    def create_summary_table(self):
+        """
+        Rebuilds the SongStats summary table, which stores the artist, year, genre, 
+        popularity, and danceability of every song-genre pair so the analyzers can 
+        aggregate without joining Song and SongGenre.
+        """
+        self.cursor.execute("DROP TABLE IF EXISTS SongStats;")
+        self.cursor.execute("""
+        CREATE TABLE SongStats AS
+        SELECT Song.artist_id, Song.year, SongGenre.genre_id, Song.popularity, Song.danceability
+        FROM Song
+        JOIN SongGenre ON Song.id = SongGenre.song_id;
+        """)
+        self.cursor.execute("CREATE INDEX ss_gy ON SongStats (genre_id, year);")
+
     def close_connection(self):
         """Closes the SQLite database connection."""
         self.conn.close()
@@ -1,7 +1,11 @@
 import sqlite3
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 from IPython.display import display
+import Dataset
 
 """
 Program: Top 5 Artists Ranking Analysis
@@ -14,10 +18,26 @@ Written by: Christian
 Date: 18/01/25
 """
 
+# Path settings applied while drawing the ranking chart
+RANKING_RC_PARAMS = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000
+}
+
 class ArtistRankingAnalyzer:
+    VALID_YEARS = Dataset.VALID_YEARS
+
     def __init__(self, db_name):
         self.db_name = db_name
-        self.conn = sqlite3.connect(db_name)
+        # Analysis is read-only, so open the database read-only with memory-mapped I/O
+        self.conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True, isolation_level=None)
+        self.conn.executescript("""
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA query_only=1;
+        """)
         self.cursor = self.conn.cursor()
 
     def get_year_range(self):
@@ -27,58 +47,57 @@ class ArtistRankingAnalyzer:
         Returns:
             tuple: A tuple containing the start year and end year.
         """
-        try:
-            start_year = int(input("Enter the start year (1998–2020): "))
-            end_year = int(input("Enter the end year (1998–2020): "))
-            if start_year < 1998 or end_year > 2020 or start_year > end_year:
-                print("Invalid range. Please enter years between 1998 and 2020.")
-                return self.get_year_range()
-            return start_year, end_year
-        except ValueError:
-            print("Invalid input. Please enter valid years.")
-            return self.get_year_range()
-
-    def fetch_artist_data(self, start_year, end_year):
+        first_year, last_year = self.VALID_YEARS
+        while True:
+            try:
+                start_year = int(input(f"Enter the start year ({first_year}–{last_year}): "))
+                end_year = int(input(f"Enter the end year ({first_year}–{last_year}): "))
+                if first_year <= start_year <= end_year <= last_year:
+                    return start_year, end_year
+                print(f"Invalid range. Please enter years between {first_year} and {last_year}.")
+            except ValueError:
+                print("Invalid input. Please enter valid years.")
+
+    def fetch_top_artists(self, start_year, end_year, weight_songs=0.6, weight_popularity=0.4):
         """
-        Fetch relevant artist data for the given year range from the SQLite database.
+        Fetch the yearly rank values of the top 5 artists for the given year range.
+
+        Rank values are calculated in SQLite using a weighted formula, and only the 
+        five artists with the highest average rank value are returned.
 
         Args:
             start_year (int): Start year of the range.
             end_year (int): End year of the range.
-
-        Returns:
-            DataFrame: A pandas DataFrame containing artist data.
-        """
-        query = f"""
-            SELECT 
-                Artist.artist_name,
-                Song.year,
-                COUNT(Song.id) AS total_songs,
-                AVG(Song.popularity) AS avg_popularity
-            FROM Song
-            JOIN Artist ON Song.artist_id = Artist.id
-            WHERE Song.year BETWEEN ? AND ?
-            GROUP BY Artist.artist_name, Song.year
-            ORDER BY Song.year, total_songs DESC;
-        """
-        data = pd.read_sql_query(query, self.conn, params=(start_year, end_year))
-        return data
-
-    def calculate_ranking(self, data, weight_songs=0.6, weight_popularity=0.4):
-        """
-        Calculate rank values for each artist using a weighted formula.
-
-        Args:
-            data (DataFrame): DataFrame containing artist data.
             weight_songs (float): Weight for the total number of songs.
             weight_popularity (float): Weight for the average popularity.
 
         Returns:
-            DataFrame: DataFrame with an additional column for rank values.
+            DataFrame: A pandas DataFrame with one row per top artist and year.
+        """
+        query = """
+            WITH yearly AS (
+                SELECT
+                    artist_id,
+                    year,
+                    COUNT(*) * ? + AVG(popularity) * ? AS rank_value
+                FROM Song
+                WHERE year BETWEEN ? AND ?
+                GROUP BY artist_id, year
+            ),
+            top_artists AS (
+                SELECT yearly.artist_id, Artist.artist_name, AVG(yearly.rank_value) AS average
+                FROM yearly
+                JOIN Artist ON Artist.id = yearly.artist_id
+                GROUP BY yearly.artist_id
+                ORDER BY average DESC, Artist.artist_name
+                LIMIT 5
+            )
+            SELECT top_artists.artist_name, yearly.year, yearly.rank_value
+            FROM yearly
+            JOIN top_artists ON yearly.artist_id = top_artists.artist_id;
         """
-        data["rank_value"] = (
-            data["total_songs"] * weight_songs + data["avg_popularity"] * weight_popularity
-        )
+        params = (weight_songs, weight_popularity, start_year, end_year)
+        data = pd.read_sql_query(query, self.conn, params=params, dtype={"year": "int16"})
         return data
 
     def generate_table(self, data, start_year, end_year):
@@ -86,7 +105,7 @@ class ArtistRankingAnalyzer:
         Create a pivot table for artist rankings over the specified year range.
 
         Args:
-            data (DataFrame): DataFrame containing artist data with rank values.
+            data (DataFrame): DataFrame containing the top artists' yearly rank values.
             start_year (int): Start year of the range.
             end_year (int): End year of the range.
 
@@ -116,10 +135,9 @@ class ArtistRankingAnalyzer:
         """
         def highlight_max(dataframe):
             styles = pd.DataFrame("", index=dataframe.index, columns=dataframe.columns)
-            for col in dataframe.columns[:-1]:  # Exclude the 'Average' column
-                if dataframe[col].dtype in ["float64", "int64"]:
-                    max_value = dataframe[col].max()
-                    styles.loc[dataframe[col] == max_value, col] = "background-color: yellow; font-weight: bold;"
+            yearly = dataframe.iloc[:, :-1]  # Exclude the 'Average' column
+            is_max = yearly.eq(yearly.max(axis=0), axis=1).to_numpy()
+            styles.iloc[:, :-1] = np.where(is_max, "background-color: yellow; font-weight: bold;", "")
             return styles
 
         styled_table = table.style.apply(highlight_max, axis=None)
@@ -134,33 +152,47 @@ class ArtistRankingAnalyzer:
             start_year (int): Start year of the range.
             end_year (int): End year of the range.
         """
-        plt.figure(figsize=(12, 6))
-
-        # Interpolate missing values for each artist
-        data_interpolated = data.interpolate(method='linear', axis=1)
-
-        for artist in data.index:
-            # Extract actual and interpolated data
-            original_yearly_data = data.loc[artist, :].drop("Average", errors="ignore")
-            interpolated_yearly_data = data_interpolated.loc[artist, :].drop("Average", errors="ignore")
-            
-            # Plot the continuous line using interpolated data
-            plt.plot(interpolated_yearly_data.index, interpolated_yearly_data.values, label=artist)
-            
-            # Add points only for years with actual values
-            plt.scatter(original_yearly_data.index, original_yearly_data.values, s=30)
-
-        # Plot yearly averages (ensure it covers all years in the range)
-        averages = data.drop("Average", axis=1).mean(axis=0)
-        averages = averages.reindex(range(start_year, end_year + 1)).interpolate(method='linear')
-        plt.plot(averages.index, averages.values, linestyle="--", color="black", label="Yearly Average")
-
-        plt.title(f"Top 5 Artists Ranking ({start_year}–{end_year})")
-        plt.xlabel("Year")
-        plt.ylabel("Rank Value")
-        plt.legend()
-        plt.grid()
-        plt.show()
+        # Simplify and chunk long line paths for this chart only
+        with plt.rc_context(RANKING_RC_PARAMS):
+            fig, ax = plt.subplots(figsize=(12, 6))
+            years = np.arange(start_year, end_year + 1)
+            colors = plt.cm.tab10(np.arange(len(data.index)))
+
+            # Interpolate missing values for each artist, then work on plain arrays of shape
+            # (artists, years) so nothing is sliced per artist
+            data_interpolated = data.interpolate(method='linear', axis=1)
+            original_values = data.drop(columns="Average").to_numpy()
+            interpolated_values = data_interpolated.drop(columns="Average").to_numpy()
+            has_value = ~np.isnan(original_values)
+
+            # Plot every artist's continuous line as a single collection
+            segments = [np.column_stack([years, values]) for values in interpolated_values]
+            ax.add_collection(LineCollection(segments, colors=colors))
+
+            # Add points only for years with actual values, in one scatter call for all artists
+            ax.scatter(
+                np.broadcast_to(years, original_values.shape)[has_value],
+                original_values[has_value],
+                s=30,
+                c=colors[np.nonzero(has_value)[0]]
+            )
+
+            # Plot yearly averages over the artists with actual values, interpolating empty years
+            counts = has_value.sum(axis=0)
+            totals = np.where(has_value, original_values, 0).sum(axis=0)
+            yearly_averages = np.divide(totals, counts, out=np.full(len(years), np.nan), where=counts > 0)
+            averages = pd.Series(yearly_averages, index=years).interpolate(method='linear')
+            average_line, = ax.plot(years, averages.to_numpy(), linestyle="--", color="black", 
+                                    label="Yearly Average")
+
+            artist_handles = [Line2D([], [], color=color, label=artist) 
+                              for artist, color in zip(data.index, colors)]
+            ax.set_title(f"Top 5 Artists Ranking ({start_year}–{end_year})")
+            ax.set_xlabel("Year")
+            ax.set_ylabel("Rank Value")
+            ax.legend(handles=artist_handles + [average_line])
+            ax.grid()
+            plt.show()
 
     def close_connection(self):
         """Close the connection to the SQLite database."""
@@ -179,20 +211,17 @@ class ArtistRankingAnalyzer:
         if start_year is None or end_year is None:
             start_year, end_year = self.get_year_range()
 
-        # Step 2: Fetch data from the database
-        data = self.fetch_artist_data(start_year, end_year)
+        # Step 2: Fetch the top 5 artists' rank values from the database
+        data = self.fetch_top_artists(start_year, end_year)
 
         if data.empty:
             print("No data available for the specified year range.")
             return
 
-        # Step 3: Calculate rank values
-        ranked_data = self.calculate_ranking(data)
-
-        # Step 4: Generate top 5 table
-        top_artists = self.generate_table(ranked_data, start_year, end_year).head(5)
+        # Step 3: Generate top 5 table
+        top_artists = self.generate_table(data, start_year, end_year)
 
-        # Step 5: Display and visualize results
+        # Step 4: Display and visualize results
         styled_table = self.display_table(top_artists)
         display(styled_table)
         self.plot_ranking(top_artists, start_year, end_year)